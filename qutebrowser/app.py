@@ -21,15 +21,8 @@
 
 import os
 import sys
-import subprocess
 import configparser
 import signal
-import pdb
-import bdb
-import base64
-import functools
-import traceback
-import faulthandler
 import json
 import time
 
@@ -50,12 +43,33 @@ from qutebrowser.config import style, config, websettings, configexc
 from qutebrowser.browser import quickmarks, cookies, cache, adblock, history
 from qutebrowser.browser.network import qutescheme, proxy, networkmanager
 from qutebrowser.mainwindow import mainwindow
-from qutebrowser.misc import (crashdialog, readline, ipc, earlyinit,
-                              savemanager, sessions)
+from qutebrowser.misc import readline, ipc, earlyinit, savemanager, sessions
 from qutebrowser.misc import utilcmds  # pylint: disable=unused-import
-from qutebrowser.utils import (log, version, message, utils, qtutils, urlutils,
-                               objreg, usertypes, standarddir)
+from qutebrowser.utils import (log, message, utils, qtutils, urlutils, objreg,
+                               usertypes, standarddir)
 # We import utilcmds to run the cmdutils.register decorators.
+# misc.crashdialog is imported lazily where it's needed, as it pulls in a lot
+# of things (pastebin, autoupdate, ...) which aren't needed without a crash.
+
+
+# The flags used to turn the URLs of open tabs into strings when recovering
+# pages.
+_URL_FLAGS = QUrl.RemovePassword | QUrl.FullyEncoded
+
+
+def _remove_crashlog(logname, logger):
+    """Remove the crash log file, ignoring it if it doesn't exist anymore.
+
+    Args:
+        logname: The path to the crash log.
+        logger: The logger to log errors to.
+    """
+    try:
+        os.remove(logname)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        logger.exception("Could not remove crash log!")
 
 
 class Application(QApplication):
@@ -69,9 +83,13 @@ class Application(QApplication):
         _crashdlg: The crash dialog currently open.
         _crashlogfile: A file handler to the fatal crash logfile.
         _event_filter: The EventFilter for the application.
-        _signal_notifier: A QSocketNotifier used for signals on Unix.
-        _signal_timer: A QTimer used to poll for signals on Windows.
-        geometry: The geometry of the last closed main window.
+        _signal_notifier: A QSocketNotifier used for signals.
+        _signal_sockets: A (read, write) tuple of the sockets used with
+                         signal.set_wakeup_fd.
+        _signal_timer: A QTimer used to poll for signals if set_wakeup_fd
+                       can't be used.
+        geometry: The geometry of the last closed main window, as a
+                  QByteArray.
     """
 
     def __init__(self, args):
@@ -101,15 +119,6 @@ class Application(QApplication):
 
         objreg.register('app', self)
 
-        if self._args.version:
-            print(version.version())
-            print()
-            print()
-            print(qutebrowser.__copyright__)
-            print()
-            print(version.GPL_BOILERPLATE.strip())
-            sys.exit(0)
-
         try:
             sent = ipc.send_to_running_instance(self._args.command)
             if sent:
@@ -214,12 +223,23 @@ class Application(QApplication):
         log.init.debug("Initializing cache...")
         diskcache = cache.DiskCache(self)
         objreg.register('cache', diskcache)
-        log.init.debug("Initializing completions...")
-        completionmodels.init()
         log.init.debug("Misc initialization...")
         self.maybe_hide_mouse_cursor()
         objreg.get('config').changed.connect(self.maybe_hide_mouse_cursor)
 
+    def _init_late_modules(self):
+        """Initialize 'modules' which aren't needed to show the first window.
+
+        This gets called via a singleShot QTimer after the first window was
+        shown, so the user sees a window as early as possible.
+
+        Note everything the first window needs (cookies, cache, adblock, ...)
+        has to be initialized in _init_modules instead, as the initial pages
+        are loaded before we get here.
+        """
+        log.init.debug("Initializing completions...")
+        completionmodels.init()
+
     @config.change_filter('ui', 'hide-mouse-cursor')
     def maybe_hide_mouse_cursor(self):
         """Hide the mouse cursor if it isn't yet and it's configured."""
@@ -245,25 +265,28 @@ class Application(QApplication):
         """Handle a segfault from a previous run."""
         logname = os.path.join(standarddir.data(), 'crash.log')
         try:
-            # First check if an old logfile exists.
-            if os.path.exists(logname):
-                with open(logname, 'r', encoding='ascii') as f:
-                    data = f.read()
-                os.remove(logname)
-                self._init_crashlogfile()
-                if data:
-                    # Crashlog exists and has data in it, so something crashed
-                    # previously.
-                    self._crashdlg = crashdialog.get_fatal_crash_dialog(
-                        self._args.debug, data)
-                    self._crashdlg.show()
-            else:
-                # There's no log file, so we can use this to display crashes to
-                # the user on the next start.
-                self._init_crashlogfile()
+            # First check if an old logfile exists. We just try to open it
+            # rather than checking with os.path.exists first, which saves us
+            # a stat() call on every start.
+            with open(logname, 'r', encoding='ascii') as f:
+                data = f.read()
+        except FileNotFoundError:
+            # There's no log file, so we can use this to display crashes to
+            # the user on the next start.
+            data = None
         except OSError:
             log.init.exception("Error while handling crash log file!")
-            self._init_crashlogfile()
+            data = None
+        else:
+            _remove_crashlog(logname, log.init)
+        self._init_crashlogfile()
+        if data:
+            # Crashlog exists and has data in it, so something crashed
+            # previously.
+            from qutebrowser.misc import crashdialog
+            self._crashdlg = crashdialog.get_fatal_crash_dialog(
+                self._args.debug, data)
+            self._crashdlg.show()
 
     def _init_crashlogfile(self):
         """Start a new logfile and redirect faulthandler to it."""
@@ -298,6 +321,7 @@ class Application(QApplication):
         self.process_pos_args(self._args.command)
         self._open_startpage()
         self._open_quickstart()
+        QTimer.singleShot(0, self._init_late_modules)
 
     def _load_session(self, name):
         """Load the default session.
@@ -457,25 +481,27 @@ class Application(QApplication):
     def _setup_signals(self):
         """Set up signal handlers.
 
-        On Windows this uses a QTimer to periodically hand control over to
-        Python so it can handle signals.
+        If possible, this uses a QSocketNotifier on a socket pair with
+        signal.set_wakeup_fd to get notified. This works on Unix, and on
+        Windows with Python >= 3.5 (where set_wakeup_fd accepts sockets and
+        socket.socketpair exists).
 
-        On Unix, it uses a QSocketNotifier with os.set_wakeup_fd to get
-        notified.
+        Otherwise, it uses a QTimer to periodically hand control over to
+        Python so it can handle signals.
         """
         signal.signal(signal.SIGINT, self.interrupt)
         signal.signal(signal.SIGTERM, self.interrupt)
 
-        if os.name == 'posix' and hasattr(signal, 'set_wakeup_fd'):
-            import fcntl
-            read_fd, write_fd = os.pipe()
-            for fd in (read_fd, write_fd):
-                flags = fcntl.fcntl(fd, fcntl.F_GETFL)
-                fcntl.fcntl(fd, fcntl.F_SETFL, flags | os.O_NONBLOCK)
+        import socket
+        if hasattr(signal, 'set_wakeup_fd') and hasattr(socket, 'socketpair'):
+            read_sock, write_sock = socket.socketpair()
+            for sock in (read_sock, write_sock):
+                sock.setblocking(False)
+            self._signal_sockets = (read_sock, write_sock)
             self._signal_notifier = QSocketNotifier(
-                read_fd, QSocketNotifier.Read, self)
+                read_sock.fileno(), QSocketNotifier.Read, self)
             self._signal_notifier.activated.connect(self._handle_signal_wakeup)
-            signal.set_wakeup_fd(write_fd)
+            signal.set_wakeup_fd(write_sock.fileno())
         else:
             self._signal_timer = usertypes.Timer(self, 'python_hacks')
             self._signal_timer.start(1000)
@@ -491,9 +517,9 @@ class Application(QApplication):
         """
         log.destroy.debug("Handling signal wakeup!")
         self._signal_notifier.setEnabled(False)
-        read_fd = self._signal_notifier.socket()
+        read_sock = self._signal_sockets[0]
         try:
-            os.read(read_fd, 1)
+            read_sock.recv(1)
         except OSError:
             log.destroy.exception("Failed to read wakeup fd.")
         self._signal_notifier.setEnabled(True)
@@ -508,32 +534,29 @@ class Application(QApplication):
 
     def _get_widgets(self):
         """Get a string list of all widgets."""
-        widgets = self.allWidgets()
-        widgets.sort(key=repr)
-        return [repr(w) for w in widgets]
+        # We sort the reprs rather than the widgets, so repr() only gets
+        # called once per widget.
+        return sorted(repr(w) for w in self.allWidgets())
 
     def _get_pyqt_objects(self, lines, obj, depth=0):
         """Recursive method for get_all_objects to get Qt objects."""
+        indent = '    ' * depth
         for kid in obj.findChildren(QObject):
-            lines.append('    ' * depth + repr(kid))
+            lines.append(indent + repr(kid))
             self._get_pyqt_objects(lines, kid, depth + 1)
 
     def get_all_objects(self):
         """Get all children of an object recursively as a string."""
         output = ['']
         widget_lines = self._get_widgets()
-        widget_lines = ['    ' + e for e in widget_lines]
-        widget_lines.insert(0, "Qt widgets - {} objects".format(
-            len(widget_lines)))
-        output += widget_lines
+        output.append("Qt widgets - {} objects".format(len(widget_lines)))
+        output.extend('    ' + e for e in widget_lines)
         pyqt_lines = []
         self._get_pyqt_objects(pyqt_lines, self)
-        pyqt_lines = ['    ' + e for e in pyqt_lines]
-        pyqt_lines.insert(0, 'Qt objects - {} objects:'.format(
-            len(pyqt_lines)))
-        output += pyqt_lines
-        output += ['']
-        output += objreg.dump_objects()
+        output.append('Qt objects - {} objects:'.format(len(pyqt_lines)))
+        output.extend('    ' + e for e in pyqt_lines)
+        output.append('')
+        output.extend(objreg.dump_objects())
         return '\n'.join(output)
 
     def _recover_pages(self, forgiving=False):
@@ -555,8 +578,7 @@ class Application(QApplication):
                                         window=win_id)
             for tab in tabbed_browser.widgets():
                 try:
-                    urlstr = tab.cur_url.toString(
-                        QUrl.RemovePassword | QUrl.FullyEncoded)
+                    urlstr = tab.cur_url.toString(_URL_FLAGS)
                     if urlstr:
                         win_pages.append(urlstr)
                 except Exception:
@@ -571,7 +593,7 @@ class Application(QApplication):
         """Save the window geometry to the state config."""
         if self.geometry is not None:
             state_config = objreg.get('state-config')
-            geom = base64.b64encode(self.geometry).decode('ASCII')
+            geom = bytes(self.geometry.toBase64()).decode('ASCII')
             state_config['geometry']['mainwindow'] = geom
 
     def _save_version(self):
@@ -583,6 +605,7 @@ class Application(QApplication):
         """Clean up the crash log file and delete it."""
         if self._crashlogfile is None:
             return
+        import faulthandler
         # We use sys.__stderr__ instead of sys.stderr here so this will still
         # work when sys.stderr got replaced, e.g. by "Python Tools for Visual
         # Studio".
@@ -592,9 +615,9 @@ class Application(QApplication):
             faulthandler.disable()
         try:
             self._crashlogfile.close()
-            os.remove(self._crashlogfile.name)
         except OSError:
-            log.destroy.exception("Could not remove crash log!")
+            log.destroy.exception("Could not close crash log!")
+        _remove_crashlog(self._crashlogfile.name, log.destroy)
 
     def _exception_hook(self, exctype, excvalue, tb):  # noqa
         """Handle uncaught python exceptions.
@@ -611,14 +634,27 @@ class Application(QApplication):
 
         log.misc.error("Uncaught exception", exc_info=exc)
 
+        # The crash dialog is only imported when it's needed, so this could
+        # fail as well - in that case we shut down like with
+        # --no-crash-dialog instead of closing all windows first.
+        try:
+            from qutebrowser.misc import crashdialog
+        except Exception:
+            log.misc.exception("Error while importing crash dialog")
+            crashdialog = None
+
+        import bdb
         is_ignored_exception = (exctype is bdb.BdbQuit or
                                 not issubclass(exctype, Exception))
 
         if self._args.pdb_postmortem:
+            # pdb is only needed with --pdb-postmortem, so we don't import it
+            # (and the cmd/code/inspect modules it pulls in) on every start.
+            import pdb
             pdb.post_mortem(tb)
 
         if (is_ignored_exception or self._args.no_crash_dialog or
-                self._args.pdb_postmortem):
+                self._args.pdb_postmortem or crashdialog is None):
             # pdb exit, KeyboardInterrupt, ...
             status = 0 if is_ignored_exception else 2
             try:
@@ -769,12 +805,10 @@ class Application(QApplication):
             session_manager = objreg.get('session-manager')
             session_manager.save(session)
         # Open a new process and immediately shutdown the existing one
+        import subprocess
         try:
             args, cwd = self._get_restart_args(pages, session)
-            if cwd is None:
-                subprocess.Popen(args)
-            else:
-                subprocess.Popen(args, cwd=cwd)
+            subprocess.Popen(args, cwd=cwd)
         except OSError:
             log.destroy.exception("Failed to restart")
             return False
@@ -798,6 +832,7 @@ class Application(QApplication):
             r = eval(s)
             out = repr(r)
         except Exception:
+            import traceback
             out = traceback.format_exc()
         qutescheme.pyeval_output = out
         tabbed_browser = objreg.get('tabbed-browser', scope='window',
@@ -810,6 +845,7 @@ class Application(QApplication):
         pages = self._recover_pages()
         cmd_history = objreg.get('command-history')[-5:]
         objects = self.get_all_objects()
+        from qutebrowser.misc import crashdialog
         self._crashdlg = crashdialog.ReportDialog(pages, cmd_history, objects)
         self._crashdlg.show()
 
@@ -824,7 +860,7 @@ class Application(QApplication):
         signal.signal(signal.SIGINT, self.interrupt_forcefully)
         signal.signal(signal.SIGTERM, self.interrupt_forcefully)
         # If we call shutdown directly here, we get a segfault.
-        QTimer.singleShot(0, functools.partial(self.shutdown, 128 + signum))
+        QTimer.singleShot(0, lambda: self.shutdown(128 + signum))
 
     def interrupt_forcefully(self, signum, _frame):
         """Interrupt forcefully on the second SIGINT/SIGTERM request.
@@ -839,7 +875,7 @@ class Application(QApplication):
         signal.signal(signal.SIGTERM, self.interrupt_really_forcefully)
         # This *should* work without a QTimer, but because of the trouble in
         # self.interrupt we're better safe than sorry.
-        QTimer.singleShot(0, functools.partial(self.exit, 128 + signum))
+        QTimer.singleShot(0, lambda: self.exit(128 + signum))
 
     def interrupt_really_forcefully(self, signum, _frame):
         """Interrupt with even more force on the third SIGINT/SIGTERM request.
@@ -903,7 +939,7 @@ class Application(QApplication):
             # in the real main event loop, or we'll get a segfault.
             log.destroy.debug("Deferring real shutdown because question was "
                               "active.")
-            QTimer.singleShot(0, functools.partial(self._shutdown, status))
+            QTimer.singleShot(0, lambda: self._shutdown(status))
         else:
             # If we have no questions to shut down, we are already in the real
             # event loop, so we can shut down immediately.
@@ -921,25 +957,28 @@ class Application(QApplication):
         # Close all windows
         QApplication.closeAllWindows()
         # Shut down IPC
-        try:
-            objreg.get('ipc-server').shutdown()
-        except KeyError:
-            pass
+        ipc_server = objreg.get('ipc-server', None)
+        if ipc_server is not None:
+            ipc_server.shutdown()
         # Save everything
-        try:
-            save_manager = objreg.get('save-manager')
-        except KeyError:
+        save_manager = objreg.get('save-manager', None)
+        if save_manager is None:
             log.destroy.debug("Save manager not initialized yet, so not "
                               "saving anything.")
         else:
+            # We collect all errors and show them in a single message box
+            # afterwards, so one failing saveable doesn't block saving the
+            # others until the user closed a dialog.
+            errors = []
             for key in save_manager.saveables:
                 try:
                     save_manager.save(key, is_exit=True)
                 except OSError as e:
-                    msgbox = QMessageBox(
-                        QMessageBox.Critical, "Error while saving!",
-                        "Error while saving {}: {}".format(key, e))
-                    msgbox.exec_()
+                    errors.append("Error while saving {}: {}".format(key, e))
+            if errors:
+                msgbox = QMessageBox(QMessageBox.Critical,
+                                     "Error while saving!", '\n'.join(errors))
+                msgbox.exec_()
         # Re-enable faulthandler to stdout, then remove crash log
         log.destroy.debug("Deactiving crash log...")
         self._destroy_crashlogfile()
@@ -950,7 +989,7 @@ class Application(QApplication):
         log.destroy.debug("Deferring QApplication::exit...")
         # We use a singleshot timer to exit here to minimize the likelihood of
         # segfaults.
-        QTimer.singleShot(0, functools.partial(self.exit, status))
+        QTimer.singleShot(0, lambda: self.exit(status))
 
     def on_focus_changed(self, _old, new):
         """Register currently focused main window in the object registry."""
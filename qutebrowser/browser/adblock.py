@@ -118,25 +118,30 @@ class HostBlocker:
                                       window='last-focused')
         if urls is None:
             return
-        for url in urls:
-            if url.scheme() == 'file':
-                try:
-                    fileobj = open(url.path(), 'rb')
-                except OSError as e:
-                    message.error(win_id, "adblock: Error while reading {}: "
-                                  "{}".format(url.path(), e.strerror))
-                    continue
-                download = FakeDownload(fileobj)
-                self._in_progress.append(download)
-                self.on_download_finished(download)
-            else:
-                fobj = io.BytesIO()
-                fobj.name = 'adblock: ' + url.host()
-                download = download_manager.get(url, fileobj=fobj,
-                                                auto_remove=True)
-                self._in_progress.append(download)
-                download.finished.connect(
-                    functools.partial(self.on_download_finished, download))
+        download_manager.begin_batch()
+        try:
+            for url in urls:
+                if url.scheme() == 'file':
+                    try:
+                        fileobj = open(url.path(), 'rb')
+                    except OSError as e:
+                        message.error(win_id, "adblock: Error while reading "
+                                      "{}: {}".format(url.path(), e.strerror))
+                        continue
+                    download = FakeDownload(fileobj)
+                    self._in_progress.append(download)
+                    self.on_download_finished(download)
+                else:
+                    fobj = io.BytesIO()
+                    fobj.name = 'adblock: ' + url.host()
+                    download = download_manager.get(url, fileobj=fobj,
+                                                    auto_remove=True)
+                    self._in_progress.append(download)
+                    download.finished.connect(
+                        functools.partial(self.on_download_finished,
+                                          download))
+        finally:
+            download_manager.end_batch()
 
     def _merge_file(self, byte_io):
         """Read and merge host files.
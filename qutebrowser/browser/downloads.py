@@ -28,8 +28,8 @@ import functools
 import collections
 
 from PyQt5.QtCore import (pyqtSlot, pyqtSignal, QObject, QTimer,
-                          Qt, QVariant, QAbstractListModel, QModelIndex, QUrl)
-from PyQt5.QtGui import QDesktopServices
+                          Qt, QAbstractListModel, QModelIndex, QUrl)
+from PyQt5.QtGui import QDesktopServices, QBrush
 from PyQt5.QtNetwork import QNetworkRequest, QNetworkReply
 # We need this import so PyQt can use it inside pyqtSlot
 from PyQt5.QtWebKitWidgets import QWebPage  # pylint: disable=unused-import
@@ -603,13 +603,31 @@ class DownloadManager(QAbstractListModel):
 
     """Manager and model for currently running downloads.
 
+    Class attributes:
+        DATA_CHANGED_DELAY: How long to collect data changes before emitting
+                            dataChanged, in milliseconds.
+
     Attributes:
         downloads: A list of active DownloadItems.
         questions: A list of Question objects to not GC them.
         _networkmanager: A NetworkManager for generic downloads.
         _win_id: The window ID the DownloadManager runs in.
+        _fg_brush: A QBrush with the foreground color for downloads.
+        _data_cache: A dict mapping DownloadItems to cached (text, bg_brush)
+                     tuples, invalidated when the item's data changes.
+        _dirty: A set of DownloadItems whose data changed since the last
+                dataChanged emission.
+        _data_changed_timer: A Timer to coalesce dataChanged emissions.
+        _root_index: An invalid QModelIndex used as parent for row changes.
+        _batch_depth: How many begin_batch() calls are currently active.
+        _pending: DownloadItems started during a batch which haven't been
+                  inserted into the model yet.
+        _role_handlers: A dict mapping item data roles to functions taking
+                        a DownloadItem and returning the data.
     """
 
+    DATA_CHANGED_DELAY = 50
+
     def __init__(self, win_id, parent=None):
         super().__init__(parent)
         self._win_id = win_id
@@ -617,6 +635,24 @@ class DownloadManager(QAbstractListModel):
         self.questions = []
         self._networkmanager = networkmanager.NetworkManager(
             win_id, None, self)
+        self._fg_brush = QBrush(config.get('colors', 'downloads.fg'))
+        self._root_index = QModelIndex()
+        self._data_cache = {}
+        self._dirty = set()
+        self._batch_depth = 0
+        self._pending = []
+        self._role_handlers = {
+            Qt.DisplayRole: lambda item: self._cached_data(item)[0],
+            Qt.ForegroundRole: lambda _item: self._fg_brush,
+            Qt.BackgroundRole: lambda item: self._cached_data(item)[1],
+            ModelRole.item: lambda item: item,
+            Qt.ToolTipRole: lambda item: item.error_msg,
+        }
+        self._data_changed_timer = usertypes.Timer(self, 'download-changed')
+        self._data_changed_timer.setSingleShot(True)
+        self._data_changed_timer.setInterval(self.DATA_CHANGED_DELAY)
+        self._data_changed_timer.timeout.connect(self._emit_data_changed)
+        objreg.get('config').changed.connect(self.on_colors_changed)
 
     def __repr__(self):
         return utils.get_repr(self, downloads=len(self.downloads))
@@ -760,11 +796,14 @@ class DownloadManager(QAbstractListModel):
         download.redirected.connect(
             functools.partial(self.on_redirect, download))
         download.basename = suggested_filename
-        idx = len(self.downloads) + 1
-        download.index = idx
-        self.beginInsertRows(QModelIndex(), idx, idx)
-        self.downloads.append(download)
-        self.endInsertRows()
+        row = len(self.downloads)
+        download.index = row + len(self._pending) + 1
+        if self._batch_depth:
+            self._pending.append(download)
+        else:
+            self.beginInsertRows(self._root_index, row, row)
+            self.downloads.append(download)
+            self.endInsertRows()
 
         if filename is not None:
             download.set_filename(filename)
@@ -784,6 +823,30 @@ class DownloadManager(QAbstractListModel):
 
         return download
 
+    def begin_batch(self):
+        """Start collecting new downloads to insert them in one go.
+
+        Every download started until the matching end_batch() call is only
+        added to the model when the batch ends, so the view gets a single
+        row insertion instead of one per download.
+        """
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """Insert all downloads collected since begin_batch()."""
+        if not self._batch_depth:
+            raise ValueError("end_batch called without begin_batch!")
+        self._batch_depth -= 1
+        if self._batch_depth or not self._pending:
+            return
+        first = len(self.downloads)
+        last = first + len(self._pending) - 1
+        self.beginInsertRows(self._root_index, first, last)
+        self.downloads.extend(self._pending)
+        self._pending = []
+        self.endInsertRows()
+        self.update_indexes()
+
     def raise_no_download(self, count):
         """Raise an exception that the download doesn't exist.
 
@@ -877,15 +940,46 @@ class DownloadManager(QAbstractListModel):
 
     @pyqtSlot(DownloadItem)
     def on_data_changed(self, download):
-        """Emit data_changed signal when download data changed."""
-        try:
-            idx = self.downloads.index(download)
-        except ValueError:
-            # download has been deleted in the meantime
-            return
-        model_idx = self.index(idx, 0)
-        qtutils.ensure_valid(model_idx)
-        self.dataChanged.emit(model_idx, model_idx)
+        """Schedule a dataChanged emission when download data changed.
+
+        With many downloads running, every one of them updates several times
+        per second, so we collect the changes and emit them together.
+        """
+        self._data_cache.pop(download, None)
+        self._dirty.add(download)
+        if not self._data_changed_timer.isActive():
+            self._data_changed_timer.start()
+
+    @pyqtSlot()
+    def _emit_data_changed(self):
+        """Emit dataChanged for contiguous ranges of changed downloads."""
+        rows = []
+        for download in self._dirty:
+            try:
+                rows.append(self.downloads.index(download))
+            except ValueError:
+                # download has been deleted in the meantime
+                pass
+        self._dirty.clear()
+        rows.sort()
+        ranges = []
+        for row in rows:
+            if ranges and ranges[-1][1] == row - 1:
+                ranges[-1][1] = row
+            else:
+                ranges.append([row, row])
+        for first, last in ranges:
+            first_idx = self.index(first, 0)
+            last_idx = self.index(last, 0)
+            qtutils.ensure_valid(first_idx)
+            qtutils.ensure_valid(last_idx)
+            self.dataChanged.emit(first_idx, last_idx)
+
+    @config.change_filter('colors')
+    def on_colors_changed(self):
+        """Update the cached colors if the config was changed."""
+        self._fg_brush = QBrush(config.get('colors', 'downloads.fg'))
+        self._data_cache.clear()
 
     @pyqtSlot(str)
     def on_error(self, msg):
@@ -946,56 +1040,72 @@ class DownloadManager(QAbstractListModel):
         Return:
             A (possibly invalid) QModelIndex.
         """
-        idx = self.index(self.rowCount() - 1)
-        return idx
+        if not self.downloads:
+            return self._root_index
+        return self.index(len(self.downloads) - 1)
 
     def remove_item(self, download):
         """Remove a given download."""
+        if download in self._pending:
+            # not inserted into the model yet
+            self._pending.remove(download)
+            download.deleteLater()
+            return
         try:
             idx = self.downloads.index(download)
         except ValueError:
             # already removed
             return
-        self.beginRemoveRows(QModelIndex(), idx, idx)
+        self.beginRemoveRows(self._root_index, idx, idx)
         del self.downloads[idx]
+        self._data_cache.pop(download, None)
         self.endRemoveRows()
         download.deleteLater()
         self.update_indexes()
 
     def remove_items(self, downloads):
-        """Remove an iterable of downloads."""
-        # On the first pass, we only generate the indices so we get the
-        # first/last one for beginRemoveRows.
-        indices = []
-        # We need to iterate over downloads twice, which won't work if it's a
-        # generator.
-        downloads = list(downloads)
+        """Remove an iterable of downloads.
+
+        If the downloads to remove are next to each other, this is a single
+        row removal. Otherwise, the model gets reset once, which is a lot
+        cheaper for the view than removing the rows one by one.
+        """
+        indices = set()
         for download in downloads:
             try:
-                indices.append(self.downloads.index(download))
+                indices.add(self.downloads.index(download))
             except ValueError:
                 # already removed
                 pass
         if not indices:
             return
-        indices.sort()
-        self.beginRemoveRows(QModelIndex(), indices[0], indices[-1])
-        for download in downloads:
-            try:
-                self.downloads.remove(download)
-            except ValueError:
-                # already removed
-                pass
-            else:
-                download.deleteLater()
-        self.endRemoveRows()
+        first, last = min(indices), max(indices)
+        contiguous = last - first + 1 == len(indices)
+        if contiguous:
+            self.beginRemoveRows(self._root_index, first, last)
+        else:
+            self.beginResetModel()
+        removed = [self.downloads[i] for i in indices]
+        self.downloads[:] = [d for i, d in enumerate(self.downloads)
+                             if i not in indices]
+        for download in removed:
+            self._data_cache.pop(download, None)
+            download.deleteLater()
+        if contiguous:
+            self.endRemoveRows()
+        else:
+            self.endResetModel()
+        self.update_indexes()
 
     def update_indexes(self):
         """Update indexes of all DownloadItems."""
         first_idx = None
         for i, d in enumerate(self.downloads, 1):
-            if first_idx is None and d.index != i:
-                first_idx = i - 1
+            if d.index != i:
+                if first_idx is None:
+                    first_idx = i - 1
+                # The index is part of the displayed text.
+                self._data_cache.pop(d, None)
             d.index = i
         if first_idx is not None:
             model_idx = self.index(first_idx, 0)
@@ -1010,29 +1120,31 @@ class DownloadManager(QAbstractListModel):
         else:
             return ""
 
+    def _cached_data(self, item):
+        """Get the (text, bg_brush) tuple for an item, computing it if needed.
+
+        The display text and background color are requested separately by
+        the view for every repaint, so we only format them once until the
+        item's data changes.
+        """
+        try:
+            return self._data_cache[item]
+        except KeyError:
+            entry = (str(item), QBrush(item.bg_color()))
+            self._data_cache[item] = entry
+            return entry
+
     def data(self, index, role):
         """Download data from DownloadManager."""
         qtutils.ensure_valid(index)
+        # Views ask for many roles we don't support, so we check the role
+        # before doing anything else.
+        handler = self._role_handlers.get(role)
+        if handler is None:
+            return None
         if index.parent().isValid() or index.column() != 0:
-            return QVariant()
-
-        item = self.downloads[index.row()]
-        if role == Qt.DisplayRole:
-            data = str(item)
-        elif role == Qt.ForegroundRole:
-            data = config.get('colors', 'downloads.fg')
-        elif role == Qt.BackgroundRole:
-            data = item.bg_color()
-        elif role == ModelRole.item:
-            data = item
-        elif role == Qt.ToolTipRole:
-            if item.error_msg is None:
-                data = QVariant()
-            else:
-                return item.error_msg
-        else:
-            data = QVariant()
-        return data
+            return None
+        return handler(self.downloads[index.row()])
 
     def flags(self, _index):
         """Override flags so items aren't selectable.
@@ -27,7 +27,7 @@ from PyQt5.QtWidgets import QListView, QSizePolicy, QMenu
 
 from qutebrowser.browser import downloads
 from qutebrowser.config import style
-from qutebrowser.utils import qtutils, utils, objreg
+from qutebrowser.utils import qtutils, utils
 
 
 def update_geometry(obj):
@@ -73,7 +73,7 @@ class DownloadView(QListView):
         }
     """
 
-    def __init__(self, win_id, parent=None):
+    def __init__(self, model, parent=None):
         super().__init__(parent)
         style.set_register_stylesheet(self)
         self.setResizeMode(QListView.Adjust)
@@ -82,10 +82,10 @@ class DownloadView(QListView):
         self.setFlow(QListView.LeftToRight)
         self.setSpacing(1)
         self._menu = None
-        model = objreg.get('download-manager', scope='window', window=win_id)
         model.rowsInserted.connect(functools.partial(update_geometry, self))
         model.rowsRemoved.connect(functools.partial(update_geometry, self))
         model.dataChanged.connect(functools.partial(update_geometry, self))
+        model.modelReset.connect(functools.partial(update_geometry, self))
         self.setModel(model)
         self.setWrapping(True)
         self.setContextMenuPolicy(Qt.CustomContextMenu)
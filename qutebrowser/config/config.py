@@ -192,10 +192,8 @@ def _init_misc():
     save_manager = objreg.get('save-manager')
     state_config = ini.ReadWriteConfigParser(standarddir.data(), 'state')
     for sect in ('general', 'geometry'):
-        try:
+        if not state_config.has_section(sect):
             state_config.add_section(sect)
-        except configparser.DuplicateSectionError:
-            pass
     # See commit a98060e020a4ba83b663813a4b9404edb47f28ad.
     state_config['general'].pop('fooled', None)
     objreg.register('state-config', state_config)
@@ -19,11 +19,9 @@
 
 """The main window of qutebrowser."""
 
-import binascii
-import base64
 import itertools
 
-from PyQt5.QtCore import pyqtSlot, QRect, QPoint, QTimer, Qt
+from PyQt5.QtCore import pyqtSlot, QRect, QPoint, QTimer, Qt, QByteArray
 from PyQt5.QtWidgets import QWidget, QVBoxLayout
 
 from qutebrowser.commands import runners, cmdutils
@@ -39,6 +37,60 @@ from qutebrowser.browser import hints, downloads, downloadview
 win_id_gen = itertools.count(0)
 
 
+# (signal, slot) pairs connected for every main window. Both are given as
+# 'objname.attr' paths, with objname being an object in the window's object
+# registry.
+_SIGNALS = (
+    # status bar
+    ('mode-manager.entered', 'statusbar.on_mode_entered'),
+    ('mode-manager.left', 'statusbar.on_mode_left'),
+    ('mode-manager.left', 'status-command.on_mode_left'),
+    ('mode-manager.left', 'prompter.on_mode_left'),
+
+    # commands
+    ('status-command.returnPressed', 'tabbed-browser.on_cmd_return_pressed'),
+
+    # messages
+    ('message-bridge.s_error', 'statusbar.disp_error'),
+    ('message-bridge.s_warning', 'statusbar.disp_warning'),
+    ('message-bridge.s_info', 'statusbar.disp_temp_text'),
+    ('message-bridge.s_set_text', 'statusbar.set_text'),
+    ('message-bridge.s_maybe_reset_text', 'statusbar.txt.maybe_reset_text'),
+    ('message-bridge.s_set_cmd_text', 'status-command.set_cmd_text'),
+
+    # statusbar
+    # FIXME some of these probably only should be triggered on mainframe
+    # loadStarted.
+    # https://github.com/The-Compiler/qutebrowser/issues/112
+    ('tabbed-browser.current_tab_changed', 'statusbar.on_tab_changed'),
+
+    ('tabbed-browser.cur_progress', 'statusbar.prog.setValue'),
+    ('tabbed-browser.cur_load_finished', 'statusbar.prog.hide'),
+    ('tabbed-browser.cur_load_started', 'statusbar.prog.on_load_started'),
+
+    ('tabbed-browser.cur_scroll_perc_changed',
+     'statusbar.percentage.set_perc'),
+
+    ('tabbed-browser.tab_index_changed',
+     'statusbar.tabindex.on_tab_index_changed'),
+
+    ('tabbed-browser.cur_statusbar_message',
+     'statusbar.txt.on_statusbar_message'),
+    ('tabbed-browser.cur_load_started', 'statusbar.txt.on_load_started'),
+
+    ('tabbed-browser.cur_url_text_changed', 'statusbar.url.set_url'),
+    ('tabbed-browser.cur_link_hovered', 'statusbar.url.set_hover_url'),
+    ('tabbed-browser.cur_load_status_changed',
+     'statusbar.url.on_load_status_changed'),
+
+    # command input / completion
+    ('mode-manager.left', 'tabbed-browser.on_mode_left'),
+    ('status-command.clear_completion_selection',
+     'completion.on_clear_completion_selection'),
+    ('status-command.hide_completion', 'completion.hide'),
+)
+
+
 class MainWindow(QWidget):
 
     """The main window of qutebrowser.
@@ -46,14 +98,25 @@ class MainWindow(QWidget):
     Adds all needed components to a vbox, initializes sub-widgets and connects
     signals.
 
+    Class attributes:
+        RESIZE_DELAY: How long to wait after the last resize event before
+                      adjusting the child widgets, in milliseconds.
+
     Attributes:
         status: The StatusBar widget.
+        _download_manager: The DownloadManager of this window.
         _downloadview: The DownloadView widget.
         _tabbed_browser: The TabbedBrowser widget.
         _vbox: The main QVBoxLayout.
         _commandrunner: The main CommandRunner instance.
+        _resize_timer: A Timer to delay the relayouting after resizes.
+        _completion_height: A (is_percentage, value) tuple of the configured
+                            completion height.
+        _completion_shrink: Whether to shrink the completion to its contents.
     """
 
+    RESIZE_DELAY = 16
+
     def __init__(self, geometry=None, parent=None):
         """Create a new main window.
 
@@ -77,6 +140,11 @@ class MainWindow(QWidget):
         objreg.register('message-bridge', message_bridge, scope='window',
                         window=self.win_id)
 
+        self._resize_timer = usertypes.Timer(self, 'resize')
+        self._resize_timer.setSingleShot(True)
+        self._resize_timer.setInterval(self.RESIZE_DELAY)
+        self._resize_timer.timeout.connect(self._on_resize_timer_timeout)
+
         self.setWindowTitle('qutebrowser')
         if geometry is not None:
             self._load_geometry(geometry)
@@ -91,11 +159,11 @@ class MainWindow(QWidget):
         self._vbox.setSpacing(0)
 
         log.init.debug("Initializing downloads...")
-        download_manager = downloads.DownloadManager(self.win_id, self)
-        objreg.register('download-manager', download_manager, scope='window',
-                        window=self.win_id)
+        self._download_manager = downloads.DownloadManager(self.win_id, self)
+        objreg.register('download-manager', self._download_manager,
+                        scope='window', window=self.win_id)
 
-        self._downloadview = downloadview.DownloadView(self.win_id)
+        self._downloadview = downloadview.DownloadView(self._download_manager)
 
         self._tabbed_browser = tabbedbrowser.TabbedBrowser(self.win_id)
         objreg.register('tabbed-browser', self._tabbed_browser, scope='window',
@@ -110,6 +178,9 @@ class MainWindow(QWidget):
         self._downloadview.show()
 
         self._completion = completionwidget.CompletionView(self.win_id, self)
+        self._completion_height = None
+        self._completion_shrink = None
+        self._update_completion_config()
 
         self._commandrunner = runners.CommandRunner(self.win_id)
 
@@ -138,10 +209,22 @@ class MainWindow(QWidget):
     def on_config_changed(self, section, option):
         """Resize the completion if related config options changed."""
         if section == 'completion' and option in ('height', 'shrink'):
-            self.resize_completion()
+            self._update_completion_config()
+            # Go through the resize timer so changing both options in a row
+            # only resizes once.
+            self._resize_timer.start()
         elif section == 'ui' and option == 'downloads-position':
             self._add_widgets()
 
+    def _update_completion_config(self):
+        """Cache the completion height/shrink settings."""
+        confheight = str(config.get('completion', 'height'))
+        if confheight.endswith('%'):
+            self._completion_height = (True, int(confheight.rstrip('%')))
+        else:
+            self._completion_height = (False, int(confheight))
+        self._completion_shrink = config.get('completion', 'shrink')
+
     def _add_widgets(self):
         """Add or readd all widgets to the VBox."""
         self._vbox.removeWidget(self._tabbed_browser)
@@ -163,18 +246,17 @@ class MainWindow(QWidget):
         state_config = objreg.get('state-config')
         try:
             data = state_config['geometry']['mainwindow']
-            geom = base64.b64decode(data, validate=True)
         except KeyError:
             # First start
             self._set_default_geometry()
-        except binascii.Error:
-            log.init.exception("Error while reading geometry")
-            self._set_default_geometry()
         else:
+            # Invalid data will make restoreGeometry fail, which is handled by
+            # _load_geometry.
+            geom = QByteArray.fromBase64(data.encode('utf-8'))
             self._load_geometry(geom)
 
     def _load_geometry(self, geom):
-        """Load geometry from a bytes object.
+        """Load geometry from a bytes object or QByteArray.
 
         If loading fails, loads default geometry.
         """
@@ -197,79 +279,61 @@ class MainWindow(QWidget):
         """Get an object for this window in the object registry."""
         return objreg.get(name, scope='window', window=self.win_id)
 
+    def _get_attr(self, path, objects):
+        """Get an attribute of an object in the window's object registry.
+
+        Args:
+            path: An 'objname.attr[.attr...]' string, e.g.
+                  'statusbar.prog.setValue'.
+            objects: A dict used to cache the objects which were already
+                     looked up.
+        """
+        name, *attrs = path.split('.')
+        try:
+            obj = objects[name]
+        except KeyError:
+            obj = self._get_object(name)
+            objects[name] = obj
+        for attr in attrs:
+            obj = getattr(obj, attr)
+        return obj
+
     def _connect_signals(self):
         """Connect all mainwindow signals."""
-        # pylint: disable=too-many-statements
-        key_config = objreg.get('key-config')
-
-        status = self._get_object('statusbar')
-        keyparsers = self._get_object('keyparsers')
-        completion_obj = self._get_object('completion')
-        tabs = self._get_object('tabbed-browser')
-        cmd = self._get_object('status-command')
-        message_bridge = self._get_object('message-bridge')
-        mode_manager = self._get_object('mode-manager')
-        prompter = self._get_object('prompter')
-
-        # misc
-        self._tabbed_browser.close_window.connect(self.close)
+        objects = {}
+        mode_manager = self._get_attr('mode-manager', objects)
+        # This needs to come before the statusbar slot, so hint mode is left
+        # before the statusbar shows that insert mode was entered.
         mode_manager.entered.connect(hints.on_mode_entered)
 
-        # status bar
-        mode_manager.entered.connect(status.on_mode_entered)
-        mode_manager.left.connect(status.on_mode_left)
-        mode_manager.left.connect(cmd.on_mode_left)
-        mode_manager.left.connect(prompter.on_mode_left)
-
-        # commands
-        keyparsers[usertypes.KeyMode.normal].keystring_updated.connect(
-            status.keystring.setText)
-        cmd.got_cmd.connect(self._commandrunner.run_safely)
-        cmd.returnPressed.connect(tabs.on_cmd_return_pressed)
-        tabs.got_cmd.connect(self._commandrunner.run_safely)
-
-        # config
-        for obj in keyparsers.values():
-            key_config.changed.connect(obj.on_keyconfig_changed)
-
-        # messages
-        message_bridge.s_error.connect(status.disp_error)
-        message_bridge.s_warning.connect(status.disp_warning)
-        message_bridge.s_info.connect(status.disp_temp_text)
-        message_bridge.s_set_text.connect(status.set_text)
-        message_bridge.s_maybe_reset_text.connect(status.txt.maybe_reset_text)
-        message_bridge.s_set_cmd_text.connect(cmd.set_cmd_text)
-        message_bridge.s_question.connect(prompter.ask_question,
-                                          Qt.DirectConnection)
-
-        # statusbar
-        # FIXME some of these probably only should be triggered on mainframe
-        # loadStarted.
-        # https://github.com/The-Compiler/qutebrowser/issues/112
-        tabs.current_tab_changed.connect(status.prog.on_tab_changed)
-        tabs.cur_progress.connect(status.prog.setValue)
-        tabs.cur_load_finished.connect(status.prog.hide)
-        tabs.cur_load_started.connect(status.prog.on_load_started)
-
-        tabs.current_tab_changed.connect(status.percentage.on_tab_changed)
-        tabs.cur_scroll_perc_changed.connect(status.percentage.set_perc)
-
-        tabs.tab_index_changed.connect(status.tabindex.on_tab_index_changed)
-
-        tabs.current_tab_changed.connect(status.txt.on_tab_changed)
-        tabs.cur_statusbar_message.connect(status.txt.on_statusbar_message)
-        tabs.cur_load_started.connect(status.txt.on_load_started)
-
-        tabs.current_tab_changed.connect(status.url.on_tab_changed)
-        tabs.cur_url_text_changed.connect(status.url.set_url)
-        tabs.cur_link_hovered.connect(status.url.set_hover_url)
-        tabs.cur_load_status_changed.connect(status.url.on_load_status_changed)
-
-        # command input / completion
-        mode_manager.left.connect(tabs.on_mode_left)
-        cmd.clear_completion_selection.connect(
-            completion_obj.on_clear_completion_selection)
-        cmd.hide_completion.connect(completion_obj.hide)
+        for signal_path, slot_path in _SIGNALS:
+            signal = self._get_attr(signal_path, objects)
+            slot = self._get_attr(slot_path, objects)
+            signal.connect(slot)
+
+        key_config = objreg.get('key-config')
+        keyparsers = self._get_object('keyparsers')
+        status = objects['statusbar']
+        tabs = objects['tabbed-browser']
+        cmd = objects['status-command']
+
+        # Connections with slots which aren't in the object registry.
+        connections = [
+            (self._tabbed_browser.close_window, self.close),
+            (keyparsers[usertypes.KeyMode.normal].keystring_updated,
+             status.keystring.setText),
+            (cmd.got_cmd, self._commandrunner.run_safely),
+            (tabs.got_cmd, self._commandrunner.run_safely),
+        ]
+        connections += [(key_config.changed, obj.on_keyconfig_changed)
+                        for obj in keyparsers.values()]
+        for signal, slot in connections:
+            signal.connect(slot)
+
+        # This needs to be a direct connection, as blocking questions expect
+        # to have an answer when s_question.emit() returns.
+        objects['message-bridge'].s_question.connect(
+            objects['prompter'].ask_question, Qt.DirectConnection)
 
     @pyqtSlot()
     def resize_completion(self):
@@ -279,14 +343,13 @@ class MainWindow(QWidget):
             # not shown anyways.
             return
         # Get the configured height/percentage.
-        confheight = str(config.get('completion', 'height'))
-        if confheight.endswith('%'):
-            perc = int(confheight.rstrip('%'))
-            height = self.height() * perc / 100
+        is_percentage, value = self._completion_height
+        if is_percentage:
+            height = self.height() * value // 100
         else:
-            height = int(confheight)
+            height = value
         # Shrink to content size if needed and shrinking is enabled
-        if config.get('completion', 'shrink'):
+        if self._completion_shrink:
             contents_height = (
                 self._completion.viewportSizeHint().height() +
                 self._completion.horizontalScrollBar().sizeHint().height())
@@ -324,24 +387,30 @@ class MainWindow(QWidget):
         else:
             self.showFullScreen()
 
+    @pyqtSlot()
+    def _on_resize_timer_timeout(self):
+        """Adjust the child widgets after the window was resized."""
+        self.resize_completion()
+        self._downloadview.updateGeometry()
+        self._tabbed_browser.tabBar().refresh()
+
     def resizeEvent(self, e):
         """Extend resizewindow's resizeEvent to adjust completion.
 
+        When the window gets dragged, we get a resize event for every step, so
+        we only adjust the other widgets once the resizing stopped.
+
         Args:
             e: The QResizeEvent
         """
         super().resizeEvent(e)
-        self.resize_completion()
-        self._downloadview.updateGeometry()
-        self._tabbed_browser.tabBar().refresh()
+        self._resize_timer.start()
 
     def closeEvent(self, e):
         """Override closeEvent to display a confirmation if needed."""
         confirm_quit = config.get('ui', 'confirm-quit')
         tab_count = self._tabbed_browser.count()
-        download_manager = objreg.get('download-manager', scope='window',
-                                      window=self.win_id)
-        download_count = download_manager.rowCount()
+        download_count = self._download_manager.rowCount()
         quit_texts = []
         # Close if set to never ask for confirmation
         if 'never' in confirm_quit:
@@ -370,6 +439,6 @@ class MainWindow(QWidget):
         e.accept()
         if len(objreg.window_registry) == 1:
             objreg.get('session-manager').save_last_window_session()
-        objreg.get('app').geometry = bytes(self.saveGeometry())
+        objreg.get('app').geometry = self.saveGeometry()
         log.destroy.debug("Closing window {}".format(self.win_id))
         self._tabbed_browser.shutdown()
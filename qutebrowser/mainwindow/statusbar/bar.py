@@ -25,6 +25,7 @@ from PyQt5.QtCore import (pyqtSignal, pyqtSlot, pyqtProperty, Qt, QTime, QSize,
                           QTimer)
 from PyQt5.QtWidgets import QWidget, QHBoxLayout, QStackedLayout, QSizePolicy
 
+from qutebrowser.browser import webview
 from qutebrowser.config import config, style
 from qutebrowser.utils import usertypes, log, objreg, utils
 from qutebrowser.mainwindow.statusbar import (command, progress, keystring,
@@ -454,6 +455,19 @@ class StatusBar(QWidget):
         if old_mode == usertypes.KeyMode.insert:
             self._set_insert_active(False)
 
+    @pyqtSlot(webview.WebView)
+    def on_tab_changed(self, tab):
+        """Notify sub-widgets when the tab has been changed.
+
+        We do this in a single slot rather than connecting all sub-widgets
+        to TabbedBrowser.current_tab_changed, so there's only one Qt -> Python
+        call per tab change.
+        """
+        self.prog.on_tab_changed(tab)
+        self.percentage.on_tab_changed(tab)
+        self.txt.on_tab_changed(tab)
+        self.url.on_tab_changed(tab)
+
     @config.change_filter('ui', 'message-timeout')
     def set_pop_timer_interval(self):
         """Update message timeout when config changed."""
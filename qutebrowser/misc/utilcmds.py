@@ -31,7 +31,6 @@ except ImportError:
 from qutebrowser.utils import log, objreg, usertypes, message
 from qutebrowser.commands import cmdutils, runners, cmdexc
 from qutebrowser.config import style
-from qutebrowser.misc import consolewidget
 
 
 @cmdutils.register(maxsplit=1, no_cmd_split=True, win_id='win_id')
@@ -147,6 +146,9 @@ def debug_console():
     try:
         con_widget = objreg.get('debug-console')
     except KeyError:
+        # The console is only needed when debugging, so we don't import it
+        # before it's actually used.
+        from qutebrowser.misc import consolewidget
         con_widget = consolewidget.ConsoleWidget()
         objreg.register('debug-console', con_widget)
     con_widget.show()
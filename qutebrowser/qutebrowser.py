@@ -135,6 +135,18 @@ def main():
         data = json.loads(args.json_args)
         args = argparse.Namespace(**data)
     earlyinit.earlyinit(args)
+    if args.version:
+        # We handle --version before importing the app module, so we don't
+        # have to import (and initialize) the whole application just to print
+        # the version.
+        from qutebrowser.utils import version
+        print(version.version())
+        print()
+        print()
+        print(qutebrowser.__copyright__)
+        print()
+        print(version.GPL_BOILERPLATE.strip())
+        sys.exit(0)
     # We do this imports late as earlyinit needs to be run first (because of
     # the harfbuzz fix and version checking).
     from qutebrowser import app
@@ -0,0 +1,249 @@
+# vim: ft=python fileencoding=utf-8 sts=4 sw=4 et:
+
+# Copyright 2014-2015 Florian Bruhin (The Compiler) <mail@qutebrowser.org>
+#
+# This file is part of qutebrowser.
+#
+# qutebrowser is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+#
+# qutebrowser is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+#
+# You should have received a copy of the GNU General Public License
+# along with qutebrowser.  If not, see <http://www.gnu.org/licenses/>.
+
+"""Tests for the DownloadManager model."""
+
+import io
+from unittest import mock
+
+import pytest
+from PyQt5.QtGui import QColor
+
+from qutebrowser.browser import downloads, downloadview
+from qutebrowser.utils import objreg
+
+
+@pytest.yield_fixture
+def config_stub(mocker, stubs):
+    """Patch the config used by downloads with a stub.
+
+    The DownloadManager connects to the changed signal of the config object
+    in objreg, so a mock with such a signal is registered as well.
+    """
+    stub = stubs.ConfigStub({
+        'colors': {'downloads.fg': QColor('white')},
+        'ui': {'remove-finished-downloads': False},
+    })
+    mocker.patch('qutebrowser.browser.downloads.config', new=stub)
+    objreg.register('config', mock.Mock(spec=['changed']))
+    yield stub
+    objreg.delete('config')
+
+
+@pytest.fixture
+def manager(qtbot, mocker, stubs, config_stub):
+    """Get a DownloadManager which creates FakeDownloadItems."""
+    # pylint: disable=unused-argument
+    mocker.patch('qutebrowser.browser.downloads.networkmanager.'
+                 'NetworkManager')
+    mocker.patch('qutebrowser.browser.downloads.usertypes.Timer',
+                 new=stubs.FakeTimer)
+    mocker.patch('qutebrowser.browser.downloads.DownloadItem',
+                 new=stubs.FakeDownloadItem)
+    return downloads.DownloadManager(win_id=0)
+
+
+@pytest.fixture
+def signals(manager):
+    """Record the row signals emitted by the manager.
+
+    Return:
+        A list of ('inserted', first, last), ('removed', first, last),
+        ('changed', first, last) and ('reset',) tuples.
+    """
+    emitted = []
+    manager.rowsInserted.connect(
+        lambda _parent, first, last: emitted.append(('inserted', first, last)))
+    manager.rowsRemoved.connect(
+        lambda _parent, first, last: emitted.append(('removed', first, last)))
+    manager.dataChanged.connect(
+        lambda top_left, bottom_right: emitted.append(
+            ('changed', top_left.row(), bottom_right.row())))
+    manager.modelReset.connect(lambda: emitted.append(('reset',)))
+    return emitted
+
+
+def add_download(manager):
+    """Start a download with the given manager and return it."""
+    return manager.fetch(mock.Mock(), fileobj=io.BytesIO(),
+                         suggested_filename='foo')
+
+
+def add_downloads(manager, count):
+    """Start count downloads and return them as a list."""
+    return [add_download(manager) for _ in range(count)]
+
+
+def indexes(manager):
+    """Get the indexes of all downloads in the manager."""
+    return [download.index for download in manager.downloads]
+
+
+class TestFetch:
+
+    """Tests for adding single downloads."""
+
+    def test_insert_rows(self, manager, signals):
+        """Make sure every download gets appended as a new row."""
+        add_downloads(manager, 2)
+        assert signals == [('inserted', 0, 0), ('inserted', 1, 1)]
+        assert indexes(manager) == [1, 2]
+
+
+class TestBatch:
+
+    """Tests for begin_batch/end_batch."""
+
+    def test_single_insert(self, manager, signals):
+        """A batch of downloads should be inserted with one signal."""
+        manager.begin_batch()
+        items = add_downloads(manager, 3)
+        assert not signals
+        assert not manager.downloads
+        manager.end_batch()
+        assert signals == [('inserted', 0, 2)]
+        assert manager.downloads == items
+        assert indexes(manager) == [1, 2, 3]
+
+    def test_existing_downloads(self, manager, signals):
+        """Batched downloads should get appended after existing ones."""
+        add_download(manager)
+        del signals[:]
+        manager.begin_batch()
+        add_downloads(manager, 2)
+        manager.end_batch()
+        assert signals == [('inserted', 1, 2)]
+        assert indexes(manager) == [1, 2, 3]
+
+    def test_nested(self, manager, signals):
+        """Downloads should only be inserted when the outermost batch ends."""
+        manager.begin_batch()
+        add_download(manager)
+        manager.begin_batch()
+        add_download(manager)
+        manager.end_batch()
+        assert not signals
+        manager.end_batch()
+        assert signals == [('inserted', 0, 1)]
+        assert indexes(manager) == [1, 2]
+
+    def test_empty(self, manager, signals):
+        """An empty batch shouldn't emit anything."""
+        manager.begin_batch()
+        manager.end_batch()
+        assert not signals
+
+    def test_remove_pending(self, manager, signals):
+        """Removing a download before the batch ended should drop it."""
+        manager.begin_batch()
+        first, second, third = add_downloads(manager, 3)
+        manager.remove_item(second)
+        manager.end_batch()
+        assert signals == [('inserted', 0, 1), ('changed', 1, 1)]
+        assert manager.downloads == [first, third]
+        assert indexes(manager) == [1, 2]
+
+    def test_end_without_begin(self, manager):
+        """end_batch without begin_batch should raise ValueError."""
+        with pytest.raises(ValueError):
+            manager.end_batch()
+
+
+class TestDataChanged:
+
+    """Tests for the coalescing of dataChanged signals."""
+
+    def test_ranges(self, manager, signals):
+        """Changed rows should be emitted as contiguous ranges."""
+        items = add_downloads(manager, 4)
+        del signals[:]
+        for i in (3, 0, 1):
+            items[i].data_changed.emit()
+        assert not signals
+        timer = manager._data_changed_timer  # pylint: disable=protected-access
+        assert timer.isActive()
+        timer.timeout.emit()
+        assert signals == [('changed', 0, 1), ('changed', 3, 3)]
+
+    def test_removed_before_flush(self, manager, signals):
+        """Downloads removed before the timer fired should be ignored."""
+        items = add_downloads(manager, 2)
+        for item in items:
+            item.data_changed.emit()
+        manager.remove_item(items[1])
+        del signals[:]
+        timer = manager._data_changed_timer  # pylint: disable=protected-access
+        timer.timeout.emit()
+        assert signals == [('changed', 0, 0)]
+
+
+class TestRemoveItems:
+
+    """Tests for remove_items."""
+
+    def test_contiguous(self, manager, signals):
+        """Adjacent downloads should be removed as one block of rows."""
+        items = add_downloads(manager, 4)
+        del signals[:]
+        manager.remove_items(items[1:3])
+        assert signals == [('removed', 1, 2), ('changed', 1, 1)]
+        assert manager.downloads == [items[0], items[3]]
+        assert indexes(manager) == [1, 2]
+
+    def test_scattered(self, manager, signals):
+        """Non-adjacent downloads should be removed with a model reset."""
+        items = add_downloads(manager, 4)
+        del signals[:]
+        manager.remove_items([items[0], items[2]])
+        assert signals == [('reset',), ('changed', 0, 1)]
+        assert manager.downloads == [items[1], items[3]]
+        assert indexes(manager) == [1, 2]
+
+    def test_scattered_view_geometry(self, qtbot, mocker, manager, signals):
+        """The DownloadView should update its geometry after a reset."""
+        mocker.patch('qutebrowser.browser.downloadview.style')
+        updates = []
+        mocker.patch('qutebrowser.browser.downloadview.update_geometry',
+                     side_effect=lambda *args: updates.append(signals[-1]))
+        view = downloadview.DownloadView(manager)
+        qtbot.add_widget(view)
+        items = add_downloads(manager, 4)
+        del updates[:]
+        manager.remove_items([items[0], items[2]])
+        assert updates == [('reset',), ('changed', 0, 1)]
+
+    def test_already_removed(self, manager, signals):
+        """Downloads which were already removed should be ignored."""
+        items = add_downloads(manager, 3)
+        manager.remove_item(items[0])
+        del signals[:]
+        manager.remove_items([items[0], items[2]])
+        assert signals == [('removed', 1, 1)]
+        assert manager.downloads == [items[1]]
+        assert indexes(manager) == [1]
+
+    def test_all_already_removed(self, manager, signals):
+        """Nothing should happen if all downloads were removed already."""
+        items = add_downloads(manager, 2)
+        manager.remove_item(items[0])
+        del signals[:]
+        manager.remove_items([items[0]])
+        assert not signals
+        assert manager.downloads == [items[1]]
+        assert indexes(manager) == [1]
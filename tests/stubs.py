@@ -272,6 +272,29 @@ class FakeTimer(QObject):
         return self._started
 
 
+class FakeDownloadItem(QObject):
+
+    """Stub for a downloads.DownloadItem."""
+
+    # pylint: disable=missing-docstring
+
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()
+    data_changed = pyqtSignal()
+    error = pyqtSignal(str)
+    redirected = pyqtSignal(QNetworkRequest, QObject)
+
+    def __init__(self, _reply=None, _win_id=None, parent=None):
+        super().__init__(parent)
+        self.index = 0
+        self.basename = '???'
+        self.fileobj = None
+        self.autoclose = True
+
+    def set_fileobj(self, fileobj):
+        self.fileobj = fileobj
+
+
 class MessageModule:
 
     """A drop-in replacement for qutebrowser.utils.message."""